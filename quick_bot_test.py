@@ -1,88 +1,131 @@
 #!/usr/bin/env python3
 """Quick test of Bot API functionality."""
 
-import requests
-import json
+import asyncio
+import httpx
 import time
 
 BASE_URL = "http://localhost:8000"
+MAX_CONCURRENCY = 4
+MAX_RETRIES = 3
 
-def test_bot_api():
+
+async def request_with_retry(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    method: str,
+    url: str,
+    **kwargs
+) -> httpx.Response:
+    """Send a request, waiting out 429 responses as advertised by Retry-After."""
+    for attempt in range(MAX_RETRIES + 1):
+        async with semaphore:
+            response = await client.request(method, url, **kwargs)
+        
+        if response.status_code != 429 or attempt == MAX_RETRIES:
+            return response
+        
+        try:
+            delay = float(response.headers.get("Retry-After", ""))
+        except ValueError:
+            delay = 2 ** attempt
+        print(f"   ⚠️  Rate limited, retrying in {delay:.0f}s...")
+        await asyncio.sleep(delay)
+    
+    return response
+
+
+async def test_bot_api():
     """Test basic bot API functionality."""
     print("🚀 Testing ChipEngine Bot API")
     print("=" * 40)
     
-    # Test 1: Health check
-    print("\n1. Testing health endpoint...")
-    try:
-        response = requests.get(f"{BASE_URL}/health")
-        if response.status_code == 200:
+    limits = httpx.Limits(
+        max_connections=MAX_CONCURRENCY,
+        max_keepalive_connections=MAX_CONCURRENCY
+    )
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    
+    async with httpx.AsyncClient(base_url=BASE_URL, limits=limits) as client:
+        
+        def send(method: str, url: str, **kwargs):
+            return request_with_retry(client, semaphore, method, url, **kwargs)
+        
+        # Health check and registration don't depend on each other
+        bot_name = f"TestBot_{int(time.time())}"
+        health_result, register_result = await asyncio.gather(
+            send("GET", "/health"),
+            send("POST", "/bots/register", json={"name": bot_name}),
+            return_exceptions=True
+        )
+        
+        # Test 1: Health check
+        print("\n1. Testing health endpoint...")
+        if isinstance(health_result, Exception):
+            print(f"❌ Cannot connect to server: {health_result}")
+            print("💡 Start server with: uv run python start_bot_api.py")
+            return False
+        if health_result.status_code == 200:
             print("✅ Health check passed")
-            print(f"   Response: {response.json()}")
+            print(f"   Response: {health_result.json()}")
         else:
-            print(f"❌ Health check failed: {response.status_code}")
+            print(f"❌ Health check failed: {health_result.status_code}")
             return False
-    except Exception as e:
-        print(f"❌ Cannot connect to server: {e}")
-        print("💡 Start server with: uv run python start_bot_api.py")
-        return False
-    
-    # Test 2: Register bot
-    print("\n2. Testing bot registration...")
-    bot_name = f"TestBot_{int(time.time())}"
-    try:
-        response = requests.post(
-            f"{BASE_URL}/bots/register",
-            json={"name": bot_name}
-        )
         
-        if response.status_code == 200:
-            bot_data = response.json()
+        # Test 2: Register bot
+        print("\n2. Testing bot registration...")
+        if isinstance(register_result, Exception):
+            print(f"❌ Registration error: {register_result}")
+            return False
+        if register_result.status_code == 200:
+            bot_data = register_result.json()
             print("✅ Bot registration successful")
             print(f"   Bot ID: {bot_data['bot_id']}")
             print(f"   API Key: {bot_data['api_key'][:8]}...")
             
             api_key = bot_data["api_key"]
-            headers = {"Authorization": f"Bearer {api_key}"}
+            client.headers["Authorization"] = f"Bearer {api_key}"
             
         else:
-            print(f"❌ Bot registration failed: {response.status_code}")
-            print(f"   Error: {response.text}")
+            print(f"❌ Bot registration failed: {register_result.status_code}")
+            print(f"   Error: {register_result.text}")
             return False
-    except Exception as e:
-        print(f"❌ Registration error: {e}")
-        return False
-    
-    # Test 3: Get bot info
-    print("\n3. Testing bot authentication...")
-    try:
-        response = requests.get(f"{BASE_URL}/bots/me", headers=headers)
-        if response.status_code == 200:
+        
+        # Authentication check and game creation only need the API key
+        auth_result, game_result = await asyncio.gather(
+            send("GET", "/bots/me"),
+            send(
+                "POST",
+                "/games/",
+                json={
+                    "game_type": "rps",
+                    "players": ["Alice", "Bob"],
+                    "config": {}
+                }
+            ),
+            return_exceptions=True
+        )
+        
+        # Test 3: Get bot info
+        print("\n3. Testing bot authentication...")
+        if isinstance(auth_result, Exception):
+            print(f"❌ Auth error: {auth_result}")
+            return False
+        if auth_result.status_code == 200:
             print("✅ Authentication successful")
-            bot_info = response.json()
+            bot_info = auth_result.json()
             print(f"   Bot: {bot_info['name']}")
         else:
-            print(f"❌ Authentication failed: {response.status_code}")
+            print(f"❌ Authentication failed: {auth_result.status_code}")
             return False
-    except Exception as e:
-        print(f"❌ Auth error: {e}")
-        return False
-    
-    # Test 4: Create game
-    print("\n4. Testing game creation...")
-    try:
-        response = requests.post(
-            f"{BASE_URL}/games/",
-            headers=headers,
-            json={
-                "game_type": "rps",
-                "players": ["Alice", "Bob"],
-                "config": {}
-            }
-        )
         
-        if response.status_code == 200:
-            game_data = response.json()
+        # Test 4: Create game
+        print("\n4. Testing game creation...")
+        if isinstance(game_result, Exception):
+            print(f"❌ Game creation error: {game_result}")
+            return False
+        if game_result.status_code == 200:
+            game_data = game_result.json()
             print("✅ Game creation successful")
             print(f"   Game ID: {game_data['game_id'][:8]}...")
             print(f"   Players: {game_data['players']}")
@@ -90,81 +133,79 @@ def test_bot_api():
             game_id = game_data["game_id"]
             
         else:
-            print(f"❌ Game creation failed: {response.status_code}")
-            print(f"   Error: {response.text}")
+            print(f"❌ Game creation failed: {game_result.status_code}")
+            print(f"   Error: {game_result.text}")
             return False
-    except Exception as e:
-        print(f"❌ Game creation error: {e}")
-        return False
-    
-    # Test 5: Make moves
-    print("\n5. Testing game moves...")
-    try:
-        # Alice plays rock
-        response = requests.post(
-            f"{BASE_URL}/games/{game_id}/moves",
-            headers=headers,
-            json={
-                "player": "Alice",
-                "action": "rock",
-                "data": {}
-            }
-        )
         
-        if response.status_code == 200:
-            move_data = response.json()
-            print("✅ First move successful")
-            print(f"   Alice plays: rock")
-            print(f"   Game over: {move_data['game_state']['game_over']}")
+        # Test 5: Make moves (sequential - each move is checked against the
+        # server-side game state left by the previous one)
+        print("\n5. Testing game moves...")
+        try:
+            # Alice plays rock
+            response = await send(
+                "POST",
+                f"/games/{game_id}/moves",
+                json={
+                    "player": "Alice",
+                    "action": "rock",
+                    "data": {}
+                }
+            )
             
-        else:
-            print(f"❌ First move failed: {response.status_code}")
-            print(f"   Error: {response.text}")
-            return False
-        
-        # Bob plays scissors
-        response = requests.post(
-            f"{BASE_URL}/games/{game_id}/moves",
-            headers=headers,
-            json={
-                "player": "Bob",
-                "action": "scissors",
-                "data": {}
-            }
-        )
-        
-        if response.status_code == 200:
-            move_data = response.json()
-            print("✅ Second move successful")
-            print(f"   Bob plays: scissors")
-            print(f"   Game over: {move_data['game_state']['game_over']}")
-            print(f"   Winner: {move_data['game_state']['winner']}")
+            if response.status_code == 200:
+                move_data = response.json()
+                print("✅ First move successful")
+                print(f"   Alice plays: rock")
+                print(f"   Game over: {move_data['game_state']['game_over']}")
+                
+            else:
+                print(f"❌ First move failed: {response.status_code}")
+                print(f"   Error: {response.text}")
+                return False
             
-        else:
-            print(f"❌ Second move failed: {response.status_code}")
-            print(f"   Error: {response.text}")
-            return False
+            # Bob plays scissors
+            response = await send(
+                "POST",
+                f"/games/{game_id}/moves",
+                json={
+                    "player": "Bob",
+                    "action": "scissors",
+                    "data": {}
+                }
+            )
             
-    except Exception as e:
-        print(f"❌ Move error: {e}")
-        return False
-    
-    # Test 6: Check game state
-    print("\n6. Testing game state retrieval...")
-    try:
-        response = requests.get(f"{BASE_URL}/games/{game_id}", headers=headers)
-        if response.status_code == 200:
-            game_state = response.json()
-            print("✅ Game state retrieval successful")
-            print(f"   Status: {game_state['status']}")
-            print(f"   Moves: {game_state['moves_count']}")
-            print(f"   Winner: {game_state['winner']}")
-        else:
-            print(f"❌ Game state failed: {response.status_code}")
+            if response.status_code == 200:
+                move_data = response.json()
+                print("✅ Second move successful")
+                print(f"   Bob plays: scissors")
+                print(f"   Game over: {move_data['game_state']['game_over']}")
+                print(f"   Winner: {move_data['game_state']['winner']}")
+                
+            else:
+                print(f"❌ Second move failed: {response.status_code}")
+                print(f"   Error: {response.text}")
+                return False
+                
+        except httpx.HTTPError as e:
+            print(f"❌ Move error: {e}")
+            return False
+        
+        # Test 6: Check game state
+        print("\n6. Testing game state retrieval...")
+        try:
+            response = await send("GET", f"/games/{game_id}")
+            if response.status_code == 200:
+                game_state = response.json()
+                print("✅ Game state retrieval successful")
+                print(f"   Status: {game_state['status']}")
+                print(f"   Moves: {game_state['moves_count']}")
+                print(f"   Winner: {game_state['winner']}")
+            else:
+                print(f"❌ Game state failed: {response.status_code}")
+                return False
+        except httpx.HTTPError as e:
+            print(f"❌ Game state error: {e}")
             return False
-    except Exception as e:
-        print(f"❌ Game state error: {e}")
-        return False
     
     print("\n" + "=" * 40)
     print("🎉 ALL TESTS PASSED!")
@@ -180,6 +221,6 @@ def test_bot_api():
     return True
 
 if __name__ == "__main__":
-    success = test_bot_api()
+    success = asyncio.run(test_bot_api())
     if not success:
         exit(1)
\ No newline at end of file
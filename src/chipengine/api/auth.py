@@ -4,10 +4,57 @@ from fastapi import HTTPException, Security, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from .database import get_db, Bot
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 import hashlib
+import threading
+import time
 
 security = HTTPBearer()
 
+# Authenticated bots cached by raw API key so a hit skips hashing and the DB
+BOT_CACHE_SIZE = 10_000
+BOT_CACHE_TTL = 30.0
+_bot_cache: "OrderedDict[str, Tuple[Bot, float]]" = OrderedDict()
+_bot_cache_keys: Dict[int, str] = {}  # bot_id -> cached API key
+_bot_cache_lock = threading.Lock()
+
+
+def _get_cached_bot(api_key: str) -> Optional[Bot]:
+    """Get a cached bot if present and not expired."""
+    with _bot_cache_lock:
+        entry = _bot_cache.get(api_key)
+        if entry is None:
+            return None
+        
+        bot, expires_at = entry
+        if expires_at < time.monotonic():
+            del _bot_cache[api_key]
+            _bot_cache_keys.pop(bot.id, None)
+            return None
+        
+        _bot_cache.move_to_end(api_key)
+        return bot
+
+
+def _cache_bot(api_key: str, bot: Bot):
+    """Store a detached bot, evicting the least recently used entry."""
+    with _bot_cache_lock:
+        _bot_cache[api_key] = (bot, time.monotonic() + BOT_CACHE_TTL)
+        _bot_cache.move_to_end(api_key)
+        _bot_cache_keys[bot.id] = api_key
+        if len(_bot_cache) > BOT_CACHE_SIZE:
+            _, (evicted, _) = _bot_cache.popitem(last=False)
+            _bot_cache_keys.pop(evicted.id, None)
+
+
+def invalidate_bot(bot_id: int):
+    """Remove a bot from the authentication cache."""
+    with _bot_cache_lock:
+        api_key = _bot_cache_keys.pop(bot_id, None)
+        if api_key is not None:
+            _bot_cache.pop(api_key, None)
+
 
 def get_current_bot(
     credentials: HTTPAuthorizationCredentials = Security(security),
@@ -18,15 +65,22 @@ def get_current_bot(
         raise HTTPException(status_code=401, detail="API key required")
     
     api_key = credentials.credentials
-    api_key_hash = Bot.hash_api_key(api_key)
-    
-    bot = db.query(Bot).filter(
-        Bot.api_key_hash == api_key_hash,
-        Bot.is_active == True
-    ).first()
     
-    if not bot:
-        raise HTTPException(status_code=401, detail="Invalid API key")
+    bot = _get_cached_bot(api_key)
+    if bot is None:
+        api_key_hash = Bot.hash_api_key(api_key)
+        bot = db.query(Bot).filter(
+            Bot.api_key_hash == api_key_hash,
+            Bot.is_active == True
+        ).first()
+        
+        if not bot:
+            raise HTTPException(status_code=401, detail="Invalid API key")
+        
+        # Detach so the instance outlives this request's session; it is
+        # shared between requests and must be treated as read-only
+        db.expunge(bot)
+        _cache_bot(api_key, bot)
     
     return bot
 
@@ -1,16 +1,101 @@
 """Database setup and models for ChipEngine."""
 
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, Text, ForeignKey
+from sqlalchemy import create_engine, event, inspect, Index, Column, Integer, String, DateTime, Boolean, JSON, ForeignKey
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
 from datetime import datetime
 import secrets
 import hashlib
+import base64
+import os
+import time
+import orjson
+
+# Any SQLAlchemy URL; defaults to a SQLite file in the working directory
+DATABASE_URL = os.environ.get("CHIPENGINE_DATABASE_URL", "sqlite:///chipengine.db")
+
+# Indexes from earlier versions that the current ones replace
+SUPERSEDED_INDEXES = ("ix_games_bot_id", "ix_games_bot_status")
+
+# hashlib.sha256 is OpenSSL's implementation, which uses SHA-NI when present
+_sha256 = hashlib.sha256
+
+# Connection pool sized for concurrent bot load, overridable per deployment
+DB_POOL_SIZE = int(os.environ.get("CHIPENGINE_DB_POOL_SIZE", 25))
+DB_MAX_OVERFLOW = int(os.environ.get("CHIPENGINE_DB_MAX_OVERFLOW", 25))
+DB_POOL_TIMEOUT_SECONDS = float(os.environ.get("CHIPENGINE_DB_POOL_TIMEOUT", 5))
+DB_POOL_RECYCLE_SECONDS = int(os.environ.get("CHIPENGINE_DB_POOL_RECYCLE", 1800))
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    """Check whether the URL is an in-memory SQLite database."""
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def _engine_options(url: str) -> dict:
+    """Get pool settings for the given database URL."""
+    if _is_sqlite_memory(url):
+        # In-memory SQLite uses a per-thread singleton pool
+        return {}
+    
+    # Fail fast when the pool is exhausted instead of waiting the 30s default
+    options = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT_SECONDS
+    }
+    if not url.startswith("sqlite"):
+        # Detect dropped server connections before handing them out
+        options["pool_pre_ping"] = True
+        options["pool_recycle"] = DB_POOL_RECYCLE_SECONDS
+    return options
+
+
+def _json_dumps(value) -> str:
+    """Serialize JSON columns with orjson (returns str for the DB driver)."""
+    return orjson.dumps(value).decode()
+
 
 Base = declarative_base()
-engine = create_engine("sqlite:///chipengine.db", echo=False)
+engine = create_engine(
+    DATABASE_URL,
+    echo=False,
+    json_serializer=_json_dumps,
+    json_deserializer=orjson.loads,
+    **_engine_options(DATABASE_URL)
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Each connection keeps its own page cache, so one budget is split across the
+# whole pool (pool size + overflow): 256 MiB over the default 50 is ~5 MiB each.
+# Hot pages beyond that are still served from the shared mmap below.
+SQLITE_CACHE_BUDGET_KIB = 256 * 1024
+SQLITE_CACHE_KIB = max(2048, SQLITE_CACHE_BUDGET_KIB // (DB_POOL_SIZE + DB_MAX_OVERFLOW))
+
+# Per-connection SQLite tuning: WAL lets readers run alongside the writer
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    f"PRAGMA cache_size=-{SQLITE_CACHE_KIB}",  # negative: size in KiB
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA foreign_keys=ON",
+)
+
+
+if DATABASE_URL.startswith("sqlite") and not _is_sqlite_memory(DATABASE_URL):
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Apply SQLITE_PRAGMAS to each new pooled connection."""
+        cursor = dbapi_connection.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
 
 class Bot(Base):
     """Bot registration model."""
@@ -19,7 +104,7 @@ class Bot(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), unique=True, index=True, nullable=False)
     api_key = Column(String(64), unique=True, index=True, nullable=False)
-    api_key_hash = Column(String(64), nullable=False)  # SHA256 hash for security
+    api_key_hash = Column(String(64), unique=True, index=True, nullable=False)  # SHA256 hash for security
     created_at = Column(DateTime, default=datetime.utcnow)
     is_active = Column(Boolean, default=True)
     
@@ -30,22 +115,22 @@ class Bot(Base):
     @staticmethod
     def generate_api_key() -> str:
         """Generate a secure API key."""
-        return secrets.token_urlsafe(32)
+        return base64.urlsafe_b64encode(secrets.token_bytes(32)).rstrip(b"=").decode("ascii")
     
     @staticmethod
     def hash_api_key(api_key: str) -> str:
         """Hash API key for secure storage."""
-        return hashlib.sha256(api_key.encode()).hexdigest()
+        return _sha256(api_key.encode()).hexdigest()
 
 
 class Game(Base):
     """Game instance model."""
     __tablename__ = "games"
     
-    id = Column(String(36), primary_key=True, index=True)  # UUID
+    id = Column(String(32), primary_key=True, index=True)  # UUIDv7 hex
     game_type = Column(String(50), nullable=False)
     status = Column(String(20), default="active")  # active, completed, abandoned
-    players = Column(Text, nullable=False)  # JSON array of player names
+    players = Column(JSON, nullable=False)  # Array of player names
     winner = Column(String(100), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     completed_at = Column(DateTime, nullable=True)
@@ -55,8 +140,33 @@ class Game(Base):
     bot = relationship("Bot", back_populates="games")
     
     # Game state and moves
-    current_state = Column(Text, nullable=True)  # JSON game state
-    moves = relationship("Move", back_populates="game")
+    current_state = Column(JSON, nullable=True)  # Game state
+    version = Column(Integer, nullable=False, default=1)  # Optimistic lock
+    # Replay order; deleting a game leaves removing its moves to the FK cascade
+    moves = relationship("Move", back_populates="game", order_by="Move.id", passive_deletes=True)
+    
+    # Serve per-bot game listings newest first, optionally by status; the
+    # listing scans these backwards for (created_at DESC, id DESC)
+    __table_args__ = (
+        Index("ix_games_bot_created", "bot_id", "created_at", "id"),
+        Index("ix_games_bot_status_created", "bot_id", "status", "created_at", "id"),
+    )
+    
+    # ORM updates check and bump version, raising StaleDataError on a lost race
+    __mapper_args__ = {"version_id_col": version}
+    
+    @staticmethod
+    def generate_id() -> str:
+        """Generate a time-ordered UUIDv7 so new games append to the key index."""
+        rand = int.from_bytes(os.urandom(10), "big")
+        value = (
+            (time.time_ns() // 1_000_000) << 80  # 48-bit unix ms timestamp
+            | 0x7 << 76                           # version 7
+            | ((rand >> 62) & 0xFFF) << 64        # 12 random bits
+            | 0b10 << 62                          # RFC 4122 variant
+            | rand & ((1 << 62) - 1)              # 62 random bits
+        )
+        return f"{value:032x}"
 
 
 class Move(Base):
@@ -64,21 +174,63 @@ class Move(Base):
     __tablename__ = "moves"
     
     id = Column(Integer, primary_key=True, index=True)
-    game_id = Column(String(36), ForeignKey("games.id"), nullable=False)
+    game_id = Column(String(32), ForeignKey("games.id", ondelete="CASCADE"), nullable=False)
     bot_id = Column(Integer, ForeignKey("bots.id"), nullable=False)
     player = Column(String(100), nullable=False)
     action = Column(String(100), nullable=False)
-    data = Column(Text, nullable=True)  # JSON additional data
+    data = Column(JSON, nullable=True)  # Additional move data
     timestamp = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
     game = relationship("Game", back_populates="moves")
     bot = relationship("Bot", back_populates="moves")
+    
+    # Covers move history loads by game (rowid order) and per-bot filtering
+    __table_args__ = (Index("ix_moves_game_bot", "game_id", "bot_id"),)
 
 
 def create_tables():
     """Create all database tables."""
     Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+
+
+def upgrade_schema(bind=engine):
+    """Bring tables created by earlier versions up to the current schema.
+
+    create_all only creates missing tables, so columns and indexes added to
+    existing ones are applied here. Every step is a no-op once applied.
+    """
+    with bind.begin() as connection:
+        game_columns = {column["name"] for column in inspect(connection).get_columns("games")}
+        if "version" not in game_columns:
+            connection.exec_driver_sql(
+                "ALTER TABLE games ADD COLUMN version INTEGER NOT NULL DEFAULT 1"
+            )
+        
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
+        
+        for name in SUPERSEDED_INDEXES:
+            connection.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+
+
+def warm_pool():
+    """Open every pooled connection up front so early requests skip the connect."""
+    if not isinstance(engine.pool, QueuePool):
+        return
+    
+    connections = []
+    try:
+        for _ in range(engine.pool.size()):
+            connection = engine.connect()
+            connections.append(connection)
+            connection.exec_driver_sql("SELECT 1")
+    finally:
+        # Closing returns the live connections to the pool
+        for connection in connections:
+            connection.close()
 
 
 def get_db():
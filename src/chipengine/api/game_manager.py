@@ -5,13 +5,18 @@ Handles game creation, state management, and coordination.
 """
 
 import uuid
-from typing import Dict, Optional
+from typing import Dict, Optional, Set, Tuple
 from datetime import datetime
 
 from ..core.base_game import BaseGame, Move
 from ..games.rps import RockPaperScissorsGame
 
 
+def _create_rps_game(game_id: str, players: list, config: dict) -> BaseGame:
+    """Create a Rock Paper Scissors game from its configuration."""
+    return RockPaperScissorsGame(game_id, players, config.get("total_rounds", 1))
+
+
 class GameManager:
     """
     Manages all active games in the system.
@@ -25,9 +30,16 @@ class GameManager:
     
     def __init__(self):
         self.active_games: Dict[str, BaseGame] = {}
+        # Tracked games that have finished, maintained as moves end them
+        self._finished_ids: Set[str] = set()
+        # Bumped whenever the counts in get_stats() change
+        self.state_version = 0
+        # (state_version, active count, finished count) as of the last get_stats()
+        self._stats_cache: Optional[Tuple[int, int, int]] = None
+        # Game type -> factory(game_id, players, config)
         self.game_registry = {
-            "rps": RockPaperScissorsGame,
-            "rock_paper_scissors": RockPaperScissorsGame
+            "rps": _create_rps_game,
+            "rock_paper_scissors": _create_rps_game
         }
     
     def create_game(self, game_type: str, players: list, config: dict = None) -> str:
@@ -36,19 +48,10 @@ class GameManager:
             raise ValueError(f"Unknown game type: {game_type}")
         
         game_id = str(uuid.uuid4())
-        game_class = self.game_registry[game_type]
-        
-        # Handle game-specific configuration
-        if config is None:
-            config = {}
-        
-        if game_type in ["rps", "rock_paper_scissors"]:
-            total_rounds = config.get("total_rounds", 1)
-            game = game_class(game_id, players, total_rounds)
-        else:
-            game = game_class(game_id, players)
+        game = self.game_registry[game_type](game_id, players, config or {})
         
         self.active_games[game_id] = game
+        self.state_version += 1
         return game_id
     
     def get_game(self, game_id: str) -> Optional[BaseGame]:
@@ -68,6 +71,9 @@ class GameManager:
         )
         
         game.apply_move(move)
+        if game.is_game_over() and game_id not in self._finished_ids:
+            self._finished_ids.add(game_id)
+            self.state_version += 1
         return game
     
     def get_game_state(self, game_id: str) -> dict:
@@ -93,26 +99,33 @@ class GameManager:
             "metadata": state.metadata
         }
     
+    def delete_game(self, game_id: str) -> bool:
+        """Remove a game from memory, returning whether it existed."""
+        self._finished_ids.discard(game_id)
+        self.state_version += 1
+        return self.active_games.pop(game_id, None) is not None
+    
     def cleanup_finished_games(self):
         """Remove finished games from memory."""
-        finished_games = [
-            game_id for game_id, game in self.active_games.items()
-            if game.is_game_over()
-        ]
+        finished_games = self._finished_ids
+        self._finished_ids = set()
         
         for game_id in finished_games:
-            del self.active_games[game_id]
+            self.active_games.pop(game_id, None)
         
+        self.state_version += 1
         return len(finished_games)
     
     def get_stats(self) -> dict:
-        """Get manager statistics."""
-        active_count = len(self.active_games)
-        finished_count = sum(1 for game in self.active_games.values() if game.is_game_over())
+        """Get manager statistics, recounting only after a change to them."""
+        cache = self._stats_cache
+        if cache is None or cache[0] != self.state_version:
+            cache = (self.state_version, len(self.active_games), len(self._finished_ids))
+            self._stats_cache = cache
         
         return {
-            "active_games": active_count,
-            "finished_games": finished_count,
+            "active_games": cache[1],
+            "finished_games": cache[2],
             "supported_games": list(self.game_registry.keys()),
             "timestamp": datetime.utcnow().isoformat()
         }
@@ -31,7 +31,7 @@ class BotInfoResponse(BaseModel):
 class CreateGameRequest(BaseModel):
     """Request to create a new game."""
     game_type: str = Field(..., description="Type of game (e.g., 'rps')")
-    players: List[str] = Field(..., min_items=2, max_items=10, description="List of player names")
+    players: List[str] = Field(..., min_length=2, max_length=10, description="List of player names")
     config: Dict[str, Any] = Field(default_factory=dict, description="Game configuration")
 
 
@@ -51,6 +51,11 @@ class MakeMoveRequest(BaseModel):
     data: Dict[str, Any] = Field(default_factory=dict, description="Additional move data")
 
 
+class MakeMovesRequest(BaseModel):
+    """Request to make several moves in a game at once."""
+    moves: List[MakeMoveRequest] = Field(..., min_length=1, max_length=100, description="Moves to apply in order")
+
+
 class GameStateResponse(BaseModel):
     """Response containing current game state."""
     game_id: str
@@ -91,6 +96,7 @@ class GameListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
 
 
 # Health and Status Models
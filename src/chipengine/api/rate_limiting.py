@@ -1,45 +1,223 @@
 """Rate limiting for bot API endpoints."""
 
 from fastapi import HTTPException, Request
-from collections import defaultdict, deque
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+import threading
 import time
-from typing import Dict, Deque
+from typing import Any, Hashable, List, Tuple
 
-class InMemoryRateLimiter:
-    """Simple in-memory rate limiter using sliding window."""
+# Limiter state is split across shards, each with its own lock and LRU bound
+RATE_LIMIT_SHARDS = 16
+RATE_LIMIT_SHARD_CAPACITY = 10_000
+
+# Sliding windows keep one byte-wide request count per slice in a 64-bit int
+WINDOW_SLICES = 8
+_WINDOW_MASK = (1 << (8 * WINDOW_SLICES)) - 1
+_BYTE_SUM = 0x0101010101010101
+
+
+class ShardedRateLimiter(ABC):
+    """Base for in-memory limiters with per-identifier state in LRU shards.
+
+    State is spread over lock-protected shards, and each shard keeps at
+    most ``shard_capacity`` identifiers, evicting the least recently seen.
+    Subclasses define the state and how it ages, fills and records a
+    request.
+    """
     
-    def __init__(self, max_requests: int = 100, window_seconds: int = 60):
+    def __init__(
+        self,
+        max_requests: int,
+        window_seconds: int,
+        shards: int = RATE_LIMIT_SHARDS,
+        shard_capacity: int = RATE_LIMIT_SHARD_CAPACITY
+    ):
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.requests: Dict[str, Deque[float]] = defaultdict(deque)
+        self.shard_capacity = shard_capacity
+        self._shards: List[Tuple[threading.Lock, "OrderedDict[Hashable, Any]"]] = [
+            (threading.Lock(), OrderedDict()) for _ in range(shards)
+        ]
     
-    def is_allowed(self, identifier: str) -> bool:
-        """Check if request is allowed for given identifier."""
-        now = time.time()
-        user_requests = self.requests[identifier]
-        
-        # Remove old requests outside the window
-        while user_requests and user_requests[0] <= now - self.window_seconds:
-            user_requests.popleft()
+    def _shard(self, identifier: Hashable) -> Tuple[threading.Lock, "OrderedDict[Hashable, Any]"]:
+        """Get the lock and states of the shard holding identifier."""
+        return self._shards[hash(identifier) % len(self._shards)]
+    
+    def _current(self, states: "OrderedDict[Hashable, Any]", identifier: Hashable, now: float) -> Any:
+        """Get identifier's state aged up to now; the shard lock must be held."""
+        state = states.get(identifier)
         
-        # Check if under limit
-        if len(user_requests) >= self.max_requests:
-            return False
+        if state is None:
+            if len(states) >= self.shard_capacity:
+                states.popitem(last=False)
+            state = states[identifier] = self._new_state(now)
+            return state
         
-        # Add current request
-        user_requests.append(now)
-        return True
+        states.move_to_end(identifier)
+        self._advance(state, now)
+        return state
+    
+    @abstractmethod
+    def _new_state(self, now: float) -> Any:
+        """Create the state of an identifier seen for the first time."""
+        pass
+    
+    @abstractmethod
+    def _advance(self, state: Any, now: float) -> None:
+        """Age state to now, dropping requests that left the window."""
+        pass
+    
+    @abstractmethod
+    def _is_full(self, state: Any, now: float) -> bool:
+        """Check whether state already holds max_requests requests."""
+        pass
+    
+    @abstractmethod
+    def _record(self, state: Any) -> None:
+        """Count one request in state."""
+        pass
+    
+    def lock_for(self, identifier: Hashable) -> threading.Lock:
+        """Get the lock that must be held around check() and commit()."""
+        return self._shard(identifier)[0]
+    
+    def check(self, identifier: Hashable, now: float) -> bool:
+        """Check if a request at now would be allowed, without counting it.
 
+        The caller must hold ``lock_for(identifier)`` and, if it goes ahead
+        with the request, call ``commit`` before releasing it.
+        """
+        states = self._shard(identifier)[1]
+        return not self._is_full(self._current(states, identifier, now), now)
+    
+    def commit(self, identifier: Hashable) -> None:
+        """Count a request that check() allowed; the lock must still be held."""
+        self._record(self._shard(identifier)[1][identifier])
+    
+    def is_allowed(self, identifier: Hashable) -> bool:
+        """Check if request is allowed for given identifier."""
+        now = time.time()
+        lock, states = self._shard(identifier)
+        with lock:
+            state = self._current(states, identifier, now)
+            if self._is_full(state, now):
+                return False
+            
+            self._record(state)
+            return True
 
-# Global rate limiters
-bot_rate_limiter = InMemoryRateLimiter(max_requests=1000, window_seconds=60)  # 1000 req/min
-game_rate_limiter = InMemoryRateLimiter(max_requests=10, window_seconds=60)   # 10 games/min
+
+class SlidingWindow:
+    """Per-identifier window state: packed slice counts and current slice."""
+    __slots__ = ("counts", "slice")
+    
+    def __init__(self, counts: int, slice_index: int):
+        self.counts = counts
+        self.slice = slice_index
+
+
+class SlidingWindowRateLimiter(ShardedRateLimiter):
+    """In-memory sliding-window rate limiter for small limits.
+
+    The window is split into ``WINDOW_SLICES`` slices and byte ``i`` of an
+    identifier's ``counts`` holds the requests made ``i`` slices ago. Moving
+    to a new slice shifts expired bytes out, and the window total is one
+    multiply that sums all bytes at once, so a check never allocates.
+    Limits of up to 255 requests per window are supported.
+    """
+    
+    def __init__(
+        self,
+        max_requests: int = 10,
+        window_seconds: int = 60,
+        shards: int = RATE_LIMIT_SHARDS,
+        shard_capacity: int = RATE_LIMIT_SHARD_CAPACITY
+    ):
+        if not 0 < max_requests <= 255:
+            raise ValueError("SlidingWindowRateLimiter supports 1-255 requests per window")
+        super().__init__(max_requests, window_seconds, shards, shard_capacity)
+        self.slice_seconds = window_seconds / WINDOW_SLICES
+    
+    def _new_state(self, now: float) -> SlidingWindow:
+        return SlidingWindow(0, int(now / self.slice_seconds))
+    
+    def _advance(self, window: SlidingWindow, now: float) -> None:
+        # Age the window: each elapsed slice shifts counts up one byte
+        current = int(now / self.slice_seconds)
+        elapsed = current - window.slice
+        if elapsed > 0:
+            if elapsed >= WINDOW_SLICES:
+                window.counts = 0
+            else:
+                window.counts = (window.counts << (8 * elapsed)) & _WINDOW_MASK
+            window.slice = current
+    
+    def _is_full(self, window: SlidingWindow, now: float) -> bool:
+        # Top byte of counts * 0x0101... is the sum of all slice counts
+        total = ((window.counts * _BYTE_SUM) & _WINDOW_MASK) >> (8 * (WINDOW_SLICES - 1))
+        return total >= self.max_requests
+    
+    def _record(self, window: SlidingWindow) -> None:
+        window.counts += 1
+
+
+class WindowCounter:
+    """Per-identifier counter state: current window index and two window counts."""
+    __slots__ = ("window", "current", "previous")
+    
+    def __init__(self, window: int):
+        self.window = window
+        self.current = 0
+        self.previous = 0
+
+
+class SlidingWindowCounterRateLimiter(ShardedRateLimiter):
+    """In-memory sliding-window counter rate limiter.
+
+    Requests are counted per fixed window, and the estimate for the
+    sliding window is the current count plus the previous window's count
+    weighted by how much of it still overlaps. Unlike a token bucket or a
+    fixed window, this never lets a client burst to twice the limit across
+    a window boundary, and it keeps only two counters per identifier.
+    """
+    
+    def __init__(
+        self,
+        max_requests: int = 100,
+        window_seconds: int = 60,
+        shards: int = RATE_LIMIT_SHARDS,
+        shard_capacity: int = RATE_LIMIT_SHARD_CAPACITY
+    ):
+        super().__init__(max_requests, window_seconds, shards, shard_capacity)
+    
+    def _new_state(self, now: float) -> WindowCounter:
+        return WindowCounter(int(now / self.window_seconds))
+    
+    def _advance(self, counter: WindowCounter, now: float) -> None:
+        # Roll over: the current count becomes the previous one only if adjacent
+        window = int(now / self.window_seconds)
+        if window != counter.window:
+            counter.previous = counter.current if window == counter.window + 1 else 0
+            counter.current = 0
+            counter.window = window
+    
+    def _is_full(self, counter: WindowCounter, now: float) -> bool:
+        overlap = counter.window + 1 - now / self.window_seconds
+        return counter.current + counter.previous * overlap >= self.max_requests
+    
+    def _record(self, counter: WindowCounter) -> None:
+        counter.current += 1
+
+
+# Global rate limiters, keyed by bot id; both checks below look these up per call
+bot_rate_limiter = SlidingWindowCounterRateLimiter(max_requests=1000, window_seconds=60)  # 1000 req/min
+game_rate_limiter = SlidingWindowRateLimiter(max_requests=10, window_seconds=60)  # 10 games/min
 
 
 def check_bot_rate_limit(request: Request, bot_id: int):
     """Check general bot API rate limit."""
-    identifier = f"bot_{bot_id}"
-    if not bot_rate_limiter.is_allowed(identifier):
+    if not bot_rate_limiter.is_allowed(bot_id):
         raise HTTPException(
             status_code=429,
             detail="Rate limit exceeded. Maximum 1000 requests per minute."
@@ -47,10 +225,20 @@ def check_bot_rate_limit(request: Request, bot_id: int):
 
 
 def check_game_creation_rate_limit(request: Request, bot_id: int):
-    """Check game creation rate limit."""
-    identifier = f"bot_game_{bot_id}"
-    if not game_rate_limiter.is_allowed(identifier):
-        raise HTTPException(
-            status_code=429,
-            detail="Game creation rate limit exceeded. Maximum 10 games per minute."
-        )
\ No newline at end of file
+    """Check the general and game creation limits, spending from both or neither.
+
+    Both shards are locked together so a request rejected by the game
+    creation limit does not use up a general API token.
+    """
+    now = time.time()
+    with bot_rate_limiter.lock_for(bot_id), game_rate_limiter.lock_for(bot_id):
+        if not bot_rate_limiter.check(bot_id, now):
+            detail = "Rate limit exceeded. Maximum 1000 requests per minute."
+        elif not game_rate_limiter.check(bot_id, now):
+            detail = "Game creation rate limit exceeded. Maximum 10 games per minute."
+        else:
+            bot_rate_limiter.commit(bot_id)
+            game_rate_limiter.commit(bot_id)
+            return
+    
+    raise HTTPException(status_code=429, detail=detail)
@@ -1,11 +1,14 @@
 """Bot game management endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Query
+from sqlalchemy import and_, func, insert, or_, select
 from sqlalchemy.orm import Session
-from typing import List, Optional
-import uuid
-import json
+from sqlalchemy.orm.exc import StaleDataError
+from typing import Any, Dict, List, Optional, Tuple, Type
+from collections import OrderedDict
 from datetime import datetime
+import base64
+import threading
 
 from ..database import get_db, Bot, Game, Move
 from ..models import (
@@ -13,6 +16,7 @@ from ..models import (
     CreateGameResponse,
     GameStateResponse,
     MakeMoveRequest,
+    MakeMovesRequest,
     MakeMoveResponse,
     GameListResponse,
     GameResultResponse,
@@ -20,40 +24,134 @@ from ..models import (
 )
 from ..auth import get_current_bot
 from ..rate_limiting import check_bot_rate_limit, check_game_creation_rate_limit
-from ...games.rps import RockPaperScissorsGame
-from ...core.base_game import Move as GameMove
+from ...games.rps import RockPaperScissorsGame, RPS_MOVES
+from ...core.base_game import BaseGame, Move as GameMove
 
 router = APIRouter(prefix="/games", tags=["bot-games"])
 
+# Restored engines by game id, tagged with the move count they reflect.
+# Cached instances are never mutated: moves always restore a fresh one.
+GAME_CACHE_SIZE = 2048
+_game_cache: "OrderedDict[str, Tuple[int, BaseGame]]" = OrderedDict()
+_game_cache_lock = threading.Lock()
+
+# Attempts at a move before giving up on a game that keeps changing under us
+MOVE_ATTEMPTS = 3
+
+# Prebuilt Core insert for the per-move hot path
+_MOVE_INSERT = insert(Move)
+
+# Per-game move count, correlated so a page of games is listed in one query
+_MOVES_COUNT = (
+    select(func.count(Move.id))
+    .where(Move.game_id == Game.id)
+    .correlate(Game)
+    .scalar_subquery()
+    .label("moves_count")
+)
+
+
+# Game type -> engine class for bot games
+GAME_FACTORIES: Dict[str, Type[BaseGame]] = {"rps": RockPaperScissorsGame}
+_SUPPORTED_GAME_TYPES = str(list(GAME_FACTORIES))
+
 
 def create_game_instance(game_type: str, players: List[str], config: dict):
     """Create appropriate game instance based on type."""
-    if game_type.lower() == "rps":
-        return RockPaperScissorsGame("bot_game", players)
-    else:
+    game_class = GAME_FACTORIES.get(game_type.lower())
+    if game_class is None:
         raise HTTPException(
             status_code=400,
-            detail=f"Unsupported game type: {game_type}. Supported: ['rps']"
+            detail=f"Unsupported game type: {game_type}. Supported: {_SUPPORTED_GAME_TYPES}"
         )
+    return game_class("bot_game", players)
+
+
+def restore_game_instance(game: Game) -> Tuple[Any, int]:
+    """Rebuild the engine for a stored game, returning it and its move count."""
+    game_instance = create_game_instance(game.game_type, game.players, {})
+    
+    snapshot = game.current_state or {}
+    if "state" in snapshot:
+        game_instance.load_state(snapshot["state"])
+        return game_instance, snapshot["moves_count"]
+    
+    # Games stored before state snapshots: replay the move history
+    for move in game.moves:
+        game_instance.apply_move(GameMove(player=move.player, action=move.action))
+    return game_instance, len(game.moves)
+
+
+def get_game_instance(game: Game) -> Tuple[Any, int]:
+    """Get a read-only engine for a stored game, reusing the cached one if current."""
+    moves_count = (game.current_state or {}).get("moves_count")
+    with _game_cache_lock:
+        entry = _game_cache.get(game.id)
+        if entry is not None and entry[0] == moves_count:
+            _game_cache.move_to_end(game.id)
+            return entry[1], moves_count
+    
+    game_instance, moves_count = restore_game_instance(game)
+    cache_game_instance(game.id, moves_count, game_instance)
+    return game_instance, moves_count
 
 
-def game_state_to_response(game: Game, game_instance) -> GameStateResponse:
+def cache_game_instance(game_id: str, moves_count: int, game_instance) -> None:
+    """Cache a committed engine, evicting the least recently used entry."""
+    with _game_cache_lock:
+        _game_cache[game_id] = (moves_count, game_instance)
+        _game_cache.move_to_end(game_id)
+        if len(_game_cache) > GAME_CACHE_SIZE:
+            _game_cache.popitem(last=False)
+
+
+def snapshot_game_state(game_instance, moves_count: int) -> dict:
+    """Serialize engine state for Game.current_state."""
+    return {"moves_count": moves_count, "state": game_instance.state.model_dump(mode="json")}
+
+
+def game_etag(game: Game) -> Optional[str]:
+    """Get an ETag for a game's state, or None if it has no state snapshot."""
+    moves_count = (game.current_state or {}).get("moves_count")
+    if moves_count is None:
+        return None
+    return f'"{game.id}-{moves_count}-{game.status}"'
+
+
+def encode_cursor(created_at: datetime, game_id: str) -> str:
+    """Encode a listing position as an opaque next_cursor token."""
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()} {game_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode a next_cursor token into the (created_at, id) it continues after."""
+    try:
+        created_at, game_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(" ", 1)
+        return datetime.fromisoformat(created_at), game_id
+    except ValueError:  # includes bad base64 and undecodable bytes
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def game_state_to_response(
+    game: Game,
+    game_instance,
+    moves_count: Optional[int] = None
+) -> GameStateResponse:
     """Convert game instance to API response."""
-    players = json.loads(game.players)
+    if moves_count is None:
+        moves_count = len(game.moves)
+    players = game.players
     
     # Get valid moves for current game state
-    try:
-        if game_instance.state.game_over:
-            valid_moves = []
-            current_player = None
-        else:
-            valid_moves = ["rock", "paper", "scissors"]  # RPS specific
-            current_player = game_instance.state.current_player
-    except:
+    if game_instance is None or game_instance.state.game_over:
         valid_moves = []
         current_player = None
+    else:
+        valid_moves = list(RPS_MOVES)  # RPS specific
+        current_player = game_instance.state.current_player
     
-    return GameStateResponse(
+    # Built from our own rows and engine state, so validation is skipped
+    return GameStateResponse.model_construct(
         game_id=game.id,
         game_type=game.game_type,
         players=players,
@@ -62,12 +160,103 @@ def game_state_to_response(game: Game, game_instance) -> GameStateResponse:
         game_over=game.status == "completed",
         winner=game.winner,
         valid_moves=valid_moves,
-        moves_count=len(game.moves),
+        moves_count=moves_count,
         created_at=game.created_at,
         metadata={}
     )
 
 
+def play_moves(
+    db: Session,
+    game_id: str,
+    bot_id: int,
+    moves: List[MakeMoveRequest]
+) -> MakeMoveResponse:
+    """Apply moves to an active game, retrying if another request updated it first."""
+    for _ in range(MOVE_ATTEMPTS):
+        game = db.query(Game).filter(Game.id == game_id).first()
+        if not game:
+            raise HTTPException(status_code=404, detail="Game not found")
+        
+        if game.status != "active":
+            raise HTTPException(status_code=400, detail="Game is not active")
+        
+        try:
+            return apply_moves(db, game, bot_id, moves)
+        except StaleDataError:
+            # The game's version moved on under us: reload and replay onto it
+            db.rollback()
+    
+    raise HTTPException(
+        status_code=409,
+        detail="Game was updated concurrently. Please retry the move."
+    )
+
+
+def apply_moves(
+    db: Session,
+    game: Game,
+    bot_id: int,
+    moves: List[MakeMoveRequest]
+) -> MakeMoveResponse:
+    """Apply moves to a stored game and persist them in one transaction."""
+    # Known from the snapshot; only games without one count their move history
+    moves_count = (game.current_state or {}).get("moves_count")
+    
+    # Recreate game instance from its stored state snapshot
+    try:
+        game_instance, moves_count = restore_game_instance(game)
+        
+        # Apply new moves
+        for move_request in moves:
+            game_instance.apply_move(GameMove(
+                player=move_request.player,
+                action=move_request.action
+            ))
+        
+    except (ValueError, KeyError) as e:  # InvalidMoveError is a ValueError
+        return MakeMoveResponse.model_construct(
+            success=False,
+            message=f"Invalid move: {str(e)}",
+            game_state=game_state_to_response(game, None, moves_count)
+        )
+    
+    # Store moves with a Core insert, skipping ORM object and identity map work
+    db.execute(_MOVE_INSERT, [
+        {
+            "game_id": game.id,
+            "bot_id": bot_id,
+            "player": move_request.player,
+            "action": move_request.action,
+            "data": move_request.data
+        }
+        for move_request in moves
+    ])
+    
+    # Snapshot the new state in the same transaction as the moves
+    moves_count += len(moves)
+    game.current_state = snapshot_game_state(game_instance, moves_count)
+    
+    # Update game status if completed
+    if game_instance.state.game_over:
+        game.status = "completed"
+        game.winner = game_instance.state.winner
+        game.completed_at = func.now()  # set by the database in the UPDATE
+    
+    # Build the response before commit expires the game
+    game_id = game.id
+    response = MakeMoveResponse.model_construct(
+        success=True,
+        message="Move made successfully" if len(moves) == 1 else "Moves made successfully",
+        game_state=game_state_to_response(game, game_instance, moves_count)
+    )
+    db.commit()
+    
+    # Only committed state is cached, so a stale move count never matches
+    cache_game_instance(game_id, moves_count, game_instance)
+    return response
+
+
 @router.post(
     "/",
     response_model=CreateGameResponse,
@@ -77,7 +266,7 @@ def game_state_to_response(game: Game, game_instance) -> GameStateResponse:
         429: {"model": ErrorResponse, "description": "Rate limit exceeded"}
     }
 )
-async def create_game(
+def create_game(
     request: Request,
     game_request: CreateGameRequest,
     current_bot: Bot = Depends(get_current_bot),
@@ -90,49 +279,42 @@ async def create_game(
     
     Rate limit: 10 games per minute per bot
     """
-    check_bot_rate_limit(request, current_bot.id)
     check_game_creation_rate_limit(request, current_bot.id)
     
-    # Validate game type
-    if game_request.game_type.lower() not in ["rps"]:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Unsupported game type: {game_request.game_type}. Supported: ['rps']"
-        )
-    
     # Generate unique game ID
-    game_id = str(uuid.uuid4())
+    game_id = Game.generate_id()
     
-    # Create game instance to validate
+    # Create game instance to validate the game type and players
     try:
         game_instance = create_game_instance(
             game_request.game_type,
             game_request.players,
             game_request.config
         )
-    except Exception as e:
+    except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     
-    # Store in database
-    game = Game(
-        id=game_id,
-        game_type=game_request.game_type.lower(),
-        players=json.dumps(game_request.players),
-        bot_id=current_bot.id,
-        status="active",
-        current_state=json.dumps({})
-    )
-    
-    db.add(game)
+    # Store in a single INSERT ... RETURNING round-trip, no refresh needed
+    created_at = db.execute(
+        insert(Game)
+        .values(
+            id=game_id,
+            game_type=game_request.game_type.lower(),
+            players=game_request.players,
+            bot_id=current_bot.id,
+            status="active",
+            current_state=snapshot_game_state(game_instance, 0)
+        )
+        .returning(Game.created_at)
+    ).scalar_one()
     db.commit()
-    db.refresh(game)
     
-    return CreateGameResponse(
+    return CreateGameResponse.model_construct(
         game_id=game_id,
         game_type=game_request.game_type.lower(),
         players=game_request.players,
         status="active",
-        created_at=game.created_at
+        created_at=created_at
     )
 
 
@@ -140,20 +322,24 @@ async def create_game(
     "/{game_id}",
     response_model=GameStateResponse,
     responses={
+        304: {"description": "Game state unchanged since the given ETag"},
         404: {"model": ErrorResponse, "description": "Game not found"},
         401: {"model": ErrorResponse, "description": "Invalid API key"}
     }
 )
-async def get_game_state(
+def get_game_state(
     game_id: str,
     request: Request,
+    response: Response,
     current_bot: Bot = Depends(get_current_bot),
     db: Session = Depends(get_db)
 ):
     """
     Get current state of a game.
     
-    Returns complete game information including valid moves.
+    Returns complete game information including valid moves. Responses
+    carry an ETag; polling with If-None-Match gets a 304 until the game
+    changes.
     """
     check_bot_rate_limit(request, current_bot.id)
     
@@ -161,19 +347,21 @@ async def get_game_state(
     if not game:
         raise HTTPException(status_code=404, detail="Game not found")
     
-    # Recreate game instance to get current state
-    players = json.loads(game.players)
+    # Unchanged since the client's last poll: skip rebuilding the state
+    etag = game_etag(game)
+    if etag is not None:
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+        response.headers.update(headers)
+    
+    # Recreate game instance from its stored state snapshot
+    players = game.players
     try:
-        game_instance = create_game_instance(game.game_type, players, {})
-        
-        # Replay moves to get current state
-        for move in game.moves:
-            game_move = GameMove(player=move.player, action=move.action)
-            game_instance.apply_move(game_move)
-            
-    except Exception as e:
+        game_instance, moves_count = get_game_instance(game)
+    except (ValueError, KeyError):
         # Fallback response if game reconstruction fails
-        return GameStateResponse(
+        return GameStateResponse.model_construct(
             game_id=game.id,
             game_type=game.game_type,
             players=players,
@@ -187,7 +375,7 @@ async def get_game_state(
             metadata={"error": "Could not reconstruct game state"}
         )
     
-    return game_state_to_response(game, game_instance)
+    return game_state_to_response(game, game_instance, moves_count)
 
 
 @router.post(
@@ -196,10 +384,11 @@ async def get_game_state(
     responses={
         404: {"model": ErrorResponse, "description": "Game not found"},
         400: {"model": ErrorResponse, "description": "Invalid move"},
-        401: {"model": ErrorResponse, "description": "Invalid API key"}
+        401: {"model": ErrorResponse, "description": "Invalid API key"},
+        409: {"model": ErrorResponse, "description": "Game kept changing concurrently"}
     }
 )
-async def make_move(
+def make_move(
     game_id: str,
     move_request: MakeMoveRequest,
     request: Request,
@@ -213,60 +402,34 @@ async def make_move(
     """
     check_bot_rate_limit(request, current_bot.id)
     
-    game = db.query(Game).filter(Game.id == game_id).first()
-    if not game:
-        raise HTTPException(status_code=404, detail="Game not found")
-    
-    if game.status != "active":
-        raise HTTPException(status_code=400, detail="Game is not active")
-    
-    # Recreate game instance
-    players = json.loads(game.players)
-    try:
-        game_instance = create_game_instance(game.game_type, players, {})
-        
-        # Replay existing moves
-        for move in game.moves:
-            game_move = GameMove(player=move.player, action=move.action)
-            game_instance.apply_move(game_move)
-        
-        # Apply new move
-        new_move = GameMove(
-            player=move_request.player,
-            action=move_request.action
-        )
-        new_state = game_instance.apply_move(new_move)
-        
-    except Exception as e:
-        return MakeMoveResponse(
-            success=False,
-            message=f"Invalid move: {str(e)}",
-            game_state=game_state_to_response(game, None)
-        )
-    
-    # Store move in database
-    db_move = Move(
-        game_id=game_id,
-        bot_id=current_bot.id,
-        player=move_request.player,
-        action=move_request.action,
-        data=json.dumps(move_request.data)
-    )
-    db.add(db_move)
-    
-    # Update game status if completed
-    if game_instance.state.game_over:
-        game.status = "completed"
-        game.winner = game_instance.state.winner
-        game.completed_at = datetime.utcnow()
+    return play_moves(db, game_id, current_bot.id, [move_request])
+
+
+@router.post(
+    "/{game_id}/moves/batch",
+    response_model=MakeMoveResponse,
+    responses={
+        404: {"model": ErrorResponse, "description": "Game not found"},
+        400: {"model": ErrorResponse, "description": "Invalid move"},
+        401: {"model": ErrorResponse, "description": "Invalid API key"},
+        409: {"model": ErrorResponse, "description": "Game kept changing concurrently"}
+    }
+)
+def make_moves_batch(
+    game_id: str,
+    moves_request: MakeMovesRequest,
+    request: Request,
+    current_bot: Bot = Depends(get_current_bot),
+    db: Session = Depends(get_db)
+):
+    """
+    Make several moves in a game with a single commit.
     
-    db.commit()
+    Moves are applied in order; if any of them is invalid, none are stored.
+    """
+    check_bot_rate_limit(request, current_bot.id)
     
-    return MakeMoveResponse(
-        success=True,
-        message="Move made successfully",
-        game_state=game_state_to_response(game, game_instance)
-    )
+    return play_moves(db, game_id, current_bot.id, moves_request.moves)
 
 
 @router.get(
@@ -276,57 +439,97 @@ async def make_move(
         401: {"model": ErrorResponse, "description": "Invalid API key"}
     }
 )
-async def list_games(
+def list_games(
     request: Request,
     current_bot: Bot = Depends(get_current_bot),
     db: Session = Depends(get_db),
     status: Optional[str] = Query(None, description="Filter by game status"),
     page: int = Query(1, ge=1, description="Page number"),
-    page_size: int = Query(10, ge=1, le=100, description="Games per page")
+    page_size: int = Query(10, ge=1, le=100, description="Games per page"),
+    cursor: Optional[str] = Query(None, max_length=128, description="next_cursor from the previous page")
 ):
     """
-    List games created by the authenticated bot.
+    List games created by the authenticated bot, newest first.
     
     Optional filters:
     - status: Filter by game status (active, completed, abandoned)
     - page: Page number (1-based)
     - page_size: Number of games per page (1-100)
+    - cursor: Continue after the previous page instead of using page;
+      stays fast however deep the listing goes
     """
     check_bot_rate_limit(request, current_bot.id)
     
-    query = db.query(Game).filter(Game.bot_id == current_bot.id)
+    filters = [Game.bot_id == current_bot.id]
     
     if status:
-        query = query.filter(Game.status == status)
+        filters.append(Game.status == status)
     
-    # Get total count
-    total = query.count()
+    # Newest first on (created_at, id): the id breaks ties and keeps the order
+    # stable, including for older games with random uuid4 ids
+    page_filters = filters
+    if cursor is not None:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        page_filters = [*filters, or_(
+            Game.created_at < cursor_created_at,
+            and_(Game.created_at == cursor_created_at, Game.id < cursor_id)
+        )]
+    offset = 0 if cursor is not None else (page - 1) * page_size
     
-    # Apply pagination
-    offset = (page - 1) * page_size
-    games = query.offset(offset).limit(page_size).all()
+    # Apply pagination, counting moves in SQL rather than loading them per game.
+    # The window count carries the total, which is computed before LIMIT/OFFSET.
+    # Only the listed columns are selected: plain rows, no state snapshot decoding.
+    rows = (
+        db.query(
+            Game.id,
+            Game.game_type,
+            Game.players,
+            Game.status,
+            Game.winner,
+            Game.created_at,
+            _MOVES_COUNT,
+            func.count().over().label("total")
+        )
+        .filter(*page_filters)
+        .order_by(Game.created_at.desc(), Game.id.desc())
+        .offset(offset)
+        .limit(page_size)
+        .all()
+    )
+    
+    # Get total count; only cursor pages and pages past the end need their own query
+    if cursor is None and (rows or not offset):
+        total = rows[0].total if rows else 0
+    else:
+        total = db.execute(
+            select(func.count()).select_from(Game).where(*filters)
+        ).scalar_one()
+    
+    next_cursor = None
+    if len(rows) == page_size:
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
     
     # Convert to response format
     game_responses = []
-    for game in games:
-        players = json.loads(game.players)
-        game_responses.append(GameStateResponse(
+    for game in rows:
+        game_responses.append(GameStateResponse.model_construct(
             game_id=game.id,
             game_type=game.game_type,
-            players=players,
+            players=game.players,
             status=game.status,
             current_player=None,  # Don't reconstruct full state for list
             game_over=game.status == "completed",
             winner=game.winner,
             valid_moves=[],
-            moves_count=len(game.moves),
+            moves_count=game.moves_count,
             created_at=game.created_at,
             metadata={}
         ))
     
-    return GameListResponse(
+    return GameListResponse.model_construct(
         games=game_responses,
         total=total,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        next_cursor=next_cursor
     )
\ No newline at end of file
@@ -1,25 +1,23 @@
 """Bot registration and management endpoints."""
 
 from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from typing import List
 
-from ..database import get_db, Bot, create_tables
+from ..database import get_db, Bot
 from ..models import (
     BotRegistrationRequest,
     BotRegistrationResponse, 
     BotInfoResponse,
     ErrorResponse
 )
-from ..auth import get_current_bot
+from ..auth import get_current_bot, invalidate_bot
 from ..rate_limiting import check_bot_rate_limit
 
 router = APIRouter(prefix="/bots", tags=["bots"])
 
-# Ensure tables exist
-create_tables()
-
 
 @router.post(
     "/register",
@@ -29,7 +27,7 @@ create_tables()
         400: {"model": ErrorResponse, "description": "Invalid request"}
     }
 )
-async def register_bot(
+def register_bot(
     request: BotRegistrationRequest,
     db: Session = Depends(get_db)
 ):
@@ -51,21 +49,22 @@ async def register_bot(
         api_key = Bot.generate_api_key()
         api_key_hash = Bot.hash_api_key(api_key)
         
-        # Create bot record
-        bot = Bot(
-            name=request.name,
-            api_key=api_key,  # Store plaintext temporarily for response
-            api_key_hash=api_key_hash
-        )
-        
-        db.add(bot)
+        # Create bot record in a single INSERT ... RETURNING round-trip
+        bot_id = db.execute(
+            insert(Bot)
+            .values(
+                name=request.name,
+                api_key=api_key,  # Store plaintext temporarily for response
+                api_key_hash=api_key_hash
+            )
+            .returning(Bot.id)
+        ).scalar_one()
         db.commit()
-        db.refresh(bot)
         
         # Return API key (only time it's shown!)
-        return BotRegistrationResponse(
-            bot_id=bot.id,
-            name=bot.name,
+        return BotRegistrationResponse.model_construct(
+            bot_id=bot_id,
+            name=request.name,
             api_key=api_key,
             message=f"Bot '{request.name}' registered successfully! Store your API key securely."
         )
@@ -85,7 +84,7 @@ async def register_bot(
         401: {"model": ErrorResponse, "description": "Invalid API key"}
     }
 )
-async def get_my_info(
+def get_my_info(
     request: Request,
     current_bot: Bot = Depends(get_current_bot)
 ):
@@ -96,7 +95,7 @@ async def get_my_info(
     """
     check_bot_rate_limit(request, current_bot.id)
     
-    return BotInfoResponse(
+    return BotInfoResponse.model_construct(
         bot_id=current_bot.id,
         name=current_bot.name,
         created_at=current_bot.created_at,
@@ -111,7 +110,7 @@ async def get_my_info(
         401: {"model": ErrorResponse, "description": "Invalid API key"}
     }
 )
-async def list_bots(
+def list_bots(
     request: Request,
     current_bot: Bot = Depends(get_current_bot),
     db: Session = Depends(get_db)
@@ -123,10 +122,14 @@ async def list_bots(
     """
     check_bot_rate_limit(request, current_bot.id)
     
-    bots = db.query(Bot).filter(Bot.is_active == True).all()
+    # Select only the public columns: plain rows, no ORM identity map or key fields
+    bots = db.execute(
+        select(Bot.id, Bot.name, Bot.created_at, Bot.is_active)
+        .where(Bot.is_active == True)
+    ).all()
     
     return [
-        BotInfoResponse(
+        BotInfoResponse.model_construct(
             bot_id=bot.id,
             name=bot.name,
             created_at=bot.created_at,
@@ -143,7 +146,7 @@ async def list_bots(
         401: {"model": ErrorResponse, "description": "Invalid API key"}
     }
 )
-async def deactivate_bot(
+def deactivate_bot(
     request: Request,
     current_bot: Bot = Depends(get_current_bot),
     db: Session = Depends(get_db)
@@ -155,7 +158,9 @@ async def deactivate_bot(
     """
     check_bot_rate_limit(request, current_bot.id)
     
-    current_bot.is_active = False
+    # current_bot is a shared cached instance, so update the row directly
+    db.query(Bot).filter(Bot.id == current_bot.id).update({Bot.is_active: False})
     db.commit()
+    invalidate_bot(current_bot.id)
     
     return {"message": f"Bot '{current_bot.name}' has been deactivated"}
\ No newline at end of file
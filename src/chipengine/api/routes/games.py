@@ -122,8 +122,7 @@ async def delete_game(game_id: str):
     if not game:
         raise HTTPException(status_code=404, detail="Game not found")
     
-    if game_id in game_manager.active_games:
-        del game_manager.active_games[game_id]
+    game_manager.delete_game(game_id)
     
     return {"message": "Game deleted successfully"}
 
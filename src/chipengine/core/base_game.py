@@ -11,6 +11,10 @@ from enum import Enum
 from pydantic import BaseModel
 
 
+class InvalidMoveError(ValueError):
+    """Raised when a move is not valid in the current game state."""
+
+
 class GameState(BaseModel):
     """Base game state that all games inherit from."""
     game_id: str
@@ -88,6 +92,10 @@ class BaseGame(ABC):
         """Get the current game state."""
         return self.state
     
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """Restore a state previously saved with ``state.model_dump()``."""
+        self.state = type(self.state).model_validate(state)
+    
     def get_game_result(self) -> Optional[GameResult]:
         """Get the final game result if the game is over."""
         if not self.is_game_over():
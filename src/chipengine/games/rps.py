@@ -8,7 +8,7 @@ import time
 from typing import Dict, List, Optional
 from enum import Enum
 
-from ..core.base_game import BaseGame, GameState, Move, GameResult
+from ..core.base_game import BaseGame, GameState, InvalidMoveError, Move, GameResult
 
 
 class RPSChoice(Enum):
@@ -18,6 +18,13 @@ class RPSChoice(Enum):
     SCISSORS = "scissors"
 
 
+# All choices, shared by every game and player
+RPS_MOVES = tuple(choice.value for choice in RPSChoice)
+
+# Choice positions in cyclic order, so (a - b) % 3 decides a round
+CHOICE_INDEX = {"rock": 0, "paper": 1, "scissors": 2}
+
+
 class RPSGameState(GameState):
     """Rock Paper Scissors specific game state."""
     round_number: int = 1
@@ -72,16 +79,12 @@ class RockPaperScissorsGame(BaseGame):
             return False
         
         # Check if move is valid RPS choice
-        try:
-            RPSChoice(move.action.lower())
-            return True
-        except ValueError:
-            return False
+        return move.action.lower() in CHOICE_INDEX
     
     def apply_move(self, move: Move) -> RPSGameState:
         """Apply a move and return new game state."""
         if not self.is_valid_move(move):
-            raise ValueError(f"Invalid move: {move}")
+            raise InvalidMoveError(f"Invalid move: {move}")
         
         # Record the move
         self.moves.append(move)
@@ -124,19 +127,11 @@ class RockPaperScissorsGame(BaseGame):
     
     def _determine_round_winner(self, choice1: str, choice2: str) -> Optional[str]:
         """Determine winner of a single round."""
-        if choice1 == choice2:
+        # Each choice beats the one before it: 0 = tie, 1 = player1, 2 = player2
+        outcome = (CHOICE_INDEX[choice1] - CHOICE_INDEX[choice2]) % 3
+        if outcome == 0:
             return None  # Tie
-        
-        wins = {
-            "rock": "scissors",
-            "paper": "rock", 
-            "scissors": "paper"
-        }
-        
-        if wins[choice1] == choice2:
-            return self.players[0]
-        else:
-            return self.players[1]
+        return self.players[outcome - 1]
     
     def get_valid_moves(self, player: str) -> List[str]:
         """Get valid moves for a player."""
@@ -149,7 +144,7 @@ class RockPaperScissorsGame(BaseGame):
         if player in self.state.moves_this_round:
             return []  # Already moved this round
         
-        return [choice.value for choice in RPSChoice]
+        return list(RPS_MOVES)
     
     def is_game_over(self) -> bool:
         """Check if the game is finished."""
@@ -9,7 +9,8 @@ Removes all overhead:
 """
 
 import time
-from typing import Dict, List, Optional, Tuple
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
 from dataclasses import dataclass
 from enum import IntEnum
 
@@ -21,9 +22,9 @@ class RPSChoice(IntEnum):
     SCISSORS = 2
 
 
-@dataclass
+@dataclass(slots=True)
 class RPSResult:
-    """Minimal result structure."""
+    """Minimal result structure (slotted: no per-instance __dict__)."""
     winner: Optional[str]
     player1_choice: int
     player2_choice: int
@@ -62,14 +63,14 @@ class OptimizedRPSGame:
     
     def play_game(self, choice1: int, choice2: int) -> RPSResult:
         """Play a complete game with integer choices."""
-        start = time.time_ns()
+        start = time.perf_counter_ns()
         
         winner_index = self.WINNER_TABLE[(choice1, choice2)]
         winner = None if winner_index is None else (
             self.player1 if winner_index == 0 else self.player2
         )
         
-        duration = time.time_ns() - start
+        duration = time.perf_counter_ns() - start
         
         return RPSResult(
             winner=winner,
@@ -94,12 +95,16 @@ class BatchRPSProcessor:
     def __init__(self):
         self.winner_table = OptimizedRPSGame.WINNER_TABLE
     
-    def process_batch(self, choices1: List[int], choices2: List[int]) -> List[Optional[int]]:
+    def process_batch(self, choices1: Sequence[int], choices2: Sequence[int]) -> List[Optional[int]]:
         """Process a batch of games, return winner indices."""
-        return [
-            self.winner_table[(c1, c2)]
-            for c1, c2 in zip(choices1, choices2)
-        ]
+        # map/zip keep the whole loop in C: no per-game Python frame
+        return list(map(self.winner_table.__getitem__, zip(choices1, choices2)))
+    
+    def count_batch(self, choices1: Sequence[int], choices2: Sequence[int]) -> Tuple[int, int, int]:
+        """Play a batch of games, return (player1 wins, player2 wins, ties)."""
+        # Counter consumes the lookups in C without building a result list
+        counts = Counter(map(self.winner_table.__getitem__, zip(choices1, choices2)))
+        return counts[0], counts[1], counts[None]
     
     def process_batch_with_timing(self, choices1: List[int], choices2: List[int]) -> Tuple[List[Optional[int]], float]:
         """Process batch and return results + total time."""
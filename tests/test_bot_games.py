@@ -0,0 +1,360 @@
+"""
+Test the bot game API in-process against a temporary database.
+"""
+
+import pytest
+from datetime import datetime
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, func, select, update
+from sqlalchemy.orm import Session, sessionmaker
+from src.chipengine.api import auth, rate_limiting
+from src.chipengine.api.database import Base, Bot, Game, Move, get_db
+from src.chipengine.api.rate_limiting import (
+    SlidingWindowCounterRateLimiter,
+    SlidingWindowRateLimiter
+)
+from src.chipengine.api.routes import bot_games, bots
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Create a fresh SQLite database for each test."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path}/chipengine.db",
+        connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def client(engine, monkeypatch):
+    """Serve the bot routers on the test database with empty caches and limits."""
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    
+    def get_test_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+    
+    # games.router also claims POST /games/, so mount the bot game router alone
+    app = FastAPI()
+    app.include_router(bots.router)
+    app.include_router(bot_games.router)
+    app.dependency_overrides[get_db] = get_test_db
+    
+    bot_limiter = SlidingWindowCounterRateLimiter(max_requests=1000, window_seconds=60)
+    game_limiter = SlidingWindowRateLimiter(max_requests=10, window_seconds=60)
+    monkeypatch.setattr(rate_limiting, "bot_rate_limiter", bot_limiter)
+    monkeypatch.setattr(rate_limiting, "game_rate_limiter", game_limiter)
+    
+    auth._bot_cache.clear()
+    auth._bot_cache_keys.clear()
+    bot_games._game_cache.clear()
+    
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def register(client, name: str = "test_bot") -> dict:
+    """Register a bot and get its authorization headers."""
+    response = client.post("/bots/register", json={"name": name})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['api_key']}"}
+
+
+def create_game(client, headers: dict) -> str:
+    """Create an RPS game between A and B and get its id."""
+    response = client.post(
+        "/games/", json={"game_type": "rps", "players": ["A", "B"]}, headers=headers
+    )
+    assert response.status_code == 200
+    return response.json()["game_id"]
+
+
+def count_moves(engine, game_id: str) -> int:
+    """Count the move rows stored for a game."""
+    with engine.connect() as connection:
+        return connection.execute(
+            select(func.count()).select_from(Move).where(Move.game_id == game_id)
+        ).scalar_one()
+
+
+class TestMoves:
+    """Test making moves, singly and in batches."""
+    
+    def test_batch_applies_all_moves(self, client, engine):
+        """A batch is applied in order with a single commit."""
+        headers = register(client)
+        game_id = create_game(client, headers)
+        
+        response = client.post(f"/games/{game_id}/moves/batch", json={"moves": [
+            {"player": "A", "action": "rock"},
+            {"player": "B", "action": "scissors"}
+        ]}, headers=headers)
+        
+        data = response.json()
+        assert data["success"]
+        assert data["game_state"]["moves_count"] == 2
+        assert count_moves(engine, game_id) == 2
+    
+    def test_invalid_batch_stores_nothing(self, client, engine):
+        """One invalid move rejects the whole batch."""
+        headers = register(client)
+        game_id = create_game(client, headers)
+        
+        response = client.post(f"/games/{game_id}/moves/batch", json={"moves": [
+            {"player": "A", "action": "rock"},
+            {"player": "A", "action": "paper"}  # A already moved this round
+        ]}, headers=headers)
+        
+        assert not response.json()["success"]
+        assert count_moves(engine, game_id) == 0
+        
+        state = client.get(f"/games/{game_id}", headers=headers).json()
+        assert state["status"] == "active"
+        assert state["moves_count"] == 0
+    
+    def test_rejected_move_skips_move_history(self, client, engine):
+        """Rejecting a move answers from the snapshot without loading past moves."""
+        headers = register(client)
+        game_id = create_game(client, headers)
+        client.post(f"/games/{game_id}/moves", json={"player": "A", "action": "rock"}, headers=headers)
+        
+        statements = []
+        
+        def listener(conn, cursor, statement, *args):
+            statements.append(statement)
+        
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            response = client.post(f"/games/{game_id}/moves", json={"player": "A", "action": "paper"}, headers=headers)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        
+        assert not response.json()["success"]
+        assert response.json()["game_state"]["moves_count"] == 1
+        assert not [statement for statement in statements if "FROM moves" in statement]
+    
+    def test_state_is_restored_from_snapshot(self, client):
+        """A game continues from its stored snapshot once the engine cache is gone."""
+        headers = register(client)
+        game_id = create_game(client, headers)
+        
+        client.post(f"/games/{game_id}/moves", json={"player": "A", "action": "paper"}, headers=headers)
+        bot_games._game_cache.clear()
+        
+        state = client.get(f"/games/{game_id}", headers=headers).json()
+        assert state["moves_count"] == 1
+        assert state["valid_moves"] == ["rock", "paper", "scissors"]
+        
+        # A already moved this round, B has not
+        response = client.post(f"/games/{game_id}/moves", json={"player": "A", "action": "rock"}, headers=headers)
+        assert not response.json()["success"]
+        bot_games._game_cache.clear()
+        response = client.post(f"/games/{game_id}/moves", json={"player": "B", "action": "rock"}, headers=headers)
+        assert response.json()["success"]
+        assert response.json()["game_state"]["moves_count"] == 2
+    
+    def test_legacy_game_replays_moves(self, client, engine):
+        """Games stored without a snapshot are rebuilt from their moves."""
+        headers = register(client)
+        with Session(engine) as db:
+            bot_id = db.execute(select(Bot.id)).scalar_one()
+            db.add(Game(
+                id="legacy-game", game_type="rps", players=["A", "B"],
+                status="active", bot_id=bot_id, current_state=None
+            ))
+            db.add(Move(game_id="legacy-game", bot_id=bot_id, player="A", action="rock"))
+            db.commit()
+        
+        state = client.get("/games/legacy-game", headers=headers)
+        assert state.json()["moves_count"] == 1
+        assert "ETag" not in state.headers
+        
+        # The replayed move counts: A cannot move again this round
+        response = client.post("/games/legacy-game/moves", json={"player": "A", "action": "paper"}, headers=headers)
+        assert not response.json()["success"]
+        
+        response = client.post("/games/legacy-game/moves", json={"player": "B", "action": "paper"}, headers=headers)
+        data = response.json()
+        assert data["success"]
+        assert data["game_state"]["moves_count"] == 2
+        assert count_moves(engine, "legacy-game") == 2
+
+
+class TestConcurrentMoves:
+    """Test optimistic locking on game updates."""
+    
+    @pytest.fixture
+    def interfering(self, engine, monkeypatch):
+        """Make another writer update the game before each of the first N attempts."""
+        attempts = {"count": 0, "interfere": 0}
+        apply_moves = bot_games.apply_moves
+        
+        def apply_moves_after_update(db, game, bot_id, moves):
+            attempts["count"] += 1
+            if attempts["count"] <= attempts["interfere"]:
+                with engine.begin() as connection:
+                    connection.execute(
+                        update(Game).where(Game.id == game.id).values(version=Game.version + 1)
+                    )
+            return apply_moves(db, game, bot_id, moves)
+        
+        monkeypatch.setattr(bot_games, "apply_moves", apply_moves_after_update)
+        return attempts
+    
+    def test_conflict_is_retried(self, client, engine, interfering):
+        """A move that loses a race is replayed onto the newer game."""
+        headers = register(client)
+        game_id = create_game(client, headers)
+        interfering["interfere"] = 1
+        
+        response = client.post(f"/games/{game_id}/moves", json={"player": "A", "action": "rock"}, headers=headers)
+        
+        assert response.status_code == 200
+        assert response.json()["game_state"]["moves_count"] == 1
+        assert interfering["count"] == 2
+        assert count_moves(engine, game_id) == 1
+    
+    def test_gives_up_after_repeated_conflicts(self, client, engine, interfering):
+        """A game that keeps changing is reported as a conflict."""
+        headers = register(client)
+        game_id = create_game(client, headers)
+        interfering["interfere"] = bot_games.MOVE_ATTEMPTS
+        
+        response = client.post(f"/games/{game_id}/moves", json={"player": "A", "action": "rock"}, headers=headers)
+        
+        assert response.status_code == 409
+        assert interfering["count"] == bot_games.MOVE_ATTEMPTS
+        assert count_moves(engine, game_id) == 0
+
+
+class TestGameState:
+    """Test conditional game state polling."""
+    
+    def test_unchanged_state_is_not_modified(self, client):
+        """Polling with the last ETag gets a 304 until a move is made."""
+        headers = register(client)
+        game_id = create_game(client, headers)
+        
+        response = client.get(f"/games/{game_id}", headers=headers)
+        etag = response.headers["ETag"]
+        
+        response = client.get(f"/games/{game_id}", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        
+        client.post(f"/games/{game_id}/moves", json={"player": "A", "action": "rock"}, headers=headers)
+        response = client.get(f"/games/{game_id}", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert response.json()["moves_count"] == 1
+
+
+class TestListGames:
+    """Test listing a bot's games."""
+    
+    def list_all(self, client, headers: dict, page_size: int) -> list:
+        """Follow next_cursor through every page, checking the total on each."""
+        listed = []
+        totals = set()
+        params = {"page_size": page_size}
+        while True:
+            response = client.get("/games/", params=params, headers=headers)
+            assert response.status_code == 200
+            data = response.json()
+            listed.extend(game["game_id"] for game in data["games"])
+            totals.add(data["total"])
+            if data["next_cursor"] is None:
+                break
+            params["cursor"] = data["next_cursor"]
+        
+        assert totals == {len(listed)}
+        return listed
+    
+    def test_cursor_pages_cover_all_games(self, client):
+        """Following next_cursor lists every game once, newest first."""
+        headers = register(client)
+        game_ids = [create_game(client, headers) for _ in range(5)]
+        
+        assert self.list_all(client, headers, page_size=2) == game_ids[::-1]
+    
+    def test_cursor_pages_through_legacy_ids(self, client, engine):
+        """Games with 36-char uuid4 ids page by creation time like new ones."""
+        headers = register(client)
+        legacy = [
+            ("6f1c2a9e-8d4b-4c1e-9f3a-2b7d5e8c1a40", datetime(2024, 1, 1, 12, 0, 0)),
+            ("0a9b8c7d-6e5f-4a3b-8c2d-1e0f9a8b7c6d", datetime(2024, 1, 2, 12, 0, 0)),
+            ("f0e1d2c3-b4a5-4968-8776-655443322110", datetime(2024, 1, 2, 12, 0, 0)),
+        ]
+        with Session(engine) as db:
+            bot_id = db.execute(select(Bot.id)).scalar_one()
+            for game_id, created_at in legacy:
+                db.add(Game(
+                    id=game_id, game_type="rps", players=["A", "B"],
+                    status="completed", bot_id=bot_id, created_at=created_at
+                ))
+            db.commit()
+        new_id = create_game(client, headers)
+        
+        # Same creation time falls back to id order
+        expected = [new_id, legacy[2][0], legacy[1][0], legacy[0][0]]
+        assert self.list_all(client, headers, page_size=1) == expected
+    
+    def test_invalid_cursor_is_rejected(self, client):
+        """A cursor that does not decode is a client error."""
+        headers = register(client)
+        
+        response = client.get("/games/", params={"cursor": "not a cursor"}, headers=headers)
+        assert response.status_code == 400
+    
+    def test_total_counts_all_pages(self, client):
+        """The total covers every game, also on pages past the end."""
+        headers = register(client)
+        other_headers = register(client, "other_bot")
+        for _ in range(3):
+            create_game(client, headers)
+        create_game(client, other_headers)
+        
+        data = client.get("/games/", params={"page_size": 2}, headers=headers).json()
+        assert len(data["games"]) == 2
+        assert data["total"] == 3
+        
+        data = client.get("/games/", params={"page": 5, "page_size": 2}, headers=headers).json()
+        assert data["games"] == []
+        assert data["total"] == 3
+
+
+class TestAuthCache:
+    """Test caching of authenticated bots."""
+    
+    def test_cached_bot_expires(self, client, engine, monkeypatch):
+        """A bot deactivated elsewhere is rejected once its cache entry expires."""
+        now = [1000.0]
+        monkeypatch.setattr(auth.time, "monotonic", lambda: now[0])
+        headers = register(client)
+        assert client.get("/bots/me", headers=headers).status_code == 200
+        
+        with engine.begin() as connection:
+            connection.execute(update(Bot).values(is_active=False))
+        assert client.get("/bots/me", headers=headers).status_code == 200
+        
+        now[0] += auth.BOT_CACHE_TTL + 1
+        assert client.get("/bots/me", headers=headers).status_code == 401
+    
+    def test_deactivation_invalidates_cache(self, client):
+        """A deactivated bot is rejected immediately."""
+        headers = register(client)
+        assert client.get("/bots/me", headers=headers).status_code == 200
+        
+        assert client.delete("/bots/me", headers=headers).status_code == 200
+        assert client.get("/bots/me", headers=headers).status_code == 401
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
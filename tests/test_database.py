@@ -0,0 +1,81 @@
+"""
+Test database model helpers.
+"""
+
+import uuid
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import Session
+from src.chipengine.api import database
+from src.chipengine.api.database import Game
+
+# Tables as created by the first release, before any columns or indexes were added
+LEGACY_SCHEMA = (
+    """CREATE TABLE bots (
+        id INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL UNIQUE,
+        api_key VARCHAR(64) NOT NULL UNIQUE, api_key_hash VARCHAR(64) NOT NULL,
+        created_at DATETIME, is_active BOOLEAN)""",
+    """CREATE TABLE games (
+        id VARCHAR(36) PRIMARY KEY, game_type VARCHAR(50) NOT NULL, status VARCHAR(20),
+        players TEXT NOT NULL, winner VARCHAR(100), created_at DATETIME,
+        completed_at DATETIME, bot_id INTEGER NOT NULL REFERENCES bots (id),
+        current_state TEXT)""",
+    """CREATE TABLE moves (
+        id INTEGER PRIMARY KEY, game_id VARCHAR(36) NOT NULL REFERENCES games (id),
+        bot_id INTEGER NOT NULL REFERENCES bots (id), player VARCHAR(100) NOT NULL,
+        action VARCHAR(100) NOT NULL, data TEXT, timestamp DATETIME)""",
+)
+
+
+class TestGameIds:
+    """Test time-ordered game id generation."""
+    
+    def test_ids_are_uuid7(self):
+        """Every id carries the version 7 and RFC 4122 variant bits."""
+        for _ in range(2000):
+            game_id = uuid.UUID(Game.generate_id())
+            assert game_id.version == 7
+            assert game_id.variant == uuid.RFC_4122
+    
+    def test_ids_sort_by_creation_time(self, monkeypatch):
+        """Ids generated in successive milliseconds sort in creation order."""
+        now = [1_700_000_000_000_000_000]
+        
+        def fake_time_ns():
+            now[0] += 1_000_000  # 1ms per call
+            return now[0]
+        
+        monkeypatch.setattr(database.time, "time_ns", fake_time_ns)
+        ids = [Game.generate_id() for _ in range(2000)]
+        assert ids == sorted(ids)
+
+
+class TestSchemaUpgrade:
+    """Test upgrading databases created by earlier versions."""
+    
+    def test_upgrades_legacy_tables(self, tmp_path):
+        """Legacy rows stay readable once the missing column and indexes exist."""
+        engine = create_engine(f"sqlite:///{tmp_path}/legacy.db")
+        with engine.begin() as connection:
+            for statement in LEGACY_SCHEMA:
+                connection.exec_driver_sql(statement)
+            connection.exec_driver_sql(
+                "INSERT INTO bots (id, name, api_key, api_key_hash, is_active) VALUES (1, 'bot', 'k', 'h', 1)"
+            )
+            connection.exec_driver_sql(
+                "INSERT INTO games (id, game_type, status, players, bot_id, current_state) "
+                "VALUES ('legacy-game', 'rps', 'active', '[\"A\", \"B\"]', 1, '{}')"
+            )
+        
+        # Running it again must be harmless
+        database.upgrade_schema(engine)
+        database.upgrade_schema(engine)
+        
+        with Session(engine) as db:
+            game = db.get(Game, "legacy-game")
+            assert game.version == 1
+            assert game.players == ["A", "B"]
+        
+        indexes = {index["name"] for index in inspect(engine).get_indexes("games")}
+        assert {"ix_games_bot_created", "ix_games_bot_status_created"} <= indexes
+        indexes = {index["name"] for index in inspect(engine).get_indexes("bots")}
+        assert "ix_bots_api_key_hash" in indexes
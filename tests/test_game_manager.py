@@ -0,0 +1,92 @@
+"""
+Test in-memory game management and its statistics.
+"""
+
+import pytest
+from datetime import datetime
+from src.chipengine.api import game_manager as game_manager_module
+from src.chipengine.api.game_manager import GameManager
+
+
+def finish_game(manager: GameManager, game_id: str):
+    """Play both moves of a single-round RPS game."""
+    manager.make_move(game_id, "Alice", "rock")
+    manager.make_move(game_id, "Bob", "scissors")
+
+
+class TestGameManagerStats:
+    """Test that statistics track game lifecycle changes."""
+    
+    def test_stats_track_create_and_finish(self):
+        """Created games are active; finished ones are also counted as finished."""
+        manager = GameManager()
+        game_id = manager.create_game("rps", ["Alice", "Bob"])
+        manager.create_game("rps", ["Carol", "Dave"])
+        
+        stats = manager.get_stats()
+        assert stats["active_games"] == 2
+        assert stats["finished_games"] == 0
+        
+        finish_game(manager, game_id)
+        stats = manager.get_stats()
+        assert stats["active_games"] == 2
+        assert stats["finished_games"] == 1
+    
+    def test_stats_track_delete(self):
+        """Deleting a finished game removes it from both counts."""
+        manager = GameManager()
+        game_id = manager.create_game("rps", ["Alice", "Bob"])
+        finish_game(manager, game_id)
+        manager.get_stats()
+        
+        assert manager.delete_game(game_id)
+        stats = manager.get_stats()
+        assert stats["active_games"] == 0
+        assert stats["finished_games"] == 0
+    
+    def test_stats_track_cleanup(self):
+        """Cleanup drops finished games and keeps the rest."""
+        manager = GameManager()
+        finished_id = manager.create_game("rps", ["Alice", "Bob"])
+        manager.create_game("rps", ["Carol", "Dave"])
+        finish_game(manager, finished_id)
+        manager.get_stats()
+        
+        assert manager.cleanup_finished_games() == 1
+        stats = manager.get_stats()
+        assert stats["active_games"] == 1
+        assert stats["finished_games"] == 0
+        assert manager.get_game(finished_id) is None
+    
+    def test_counts_are_cached_until_state_version_bumps(self):
+        """Counts are reused until state_version changes."""
+        manager = GameManager()
+        manager.create_game("rps", ["Alice", "Bob"])
+        assert manager.get_stats()["active_games"] == 1
+        
+        # A change that bypasses the manager is not seen until the version moves
+        manager.active_games["untracked"] = None
+        assert manager.get_stats()["active_games"] == 1
+        
+        manager.state_version += 1
+        assert manager.get_stats()["active_games"] == 2
+    
+    def test_timestamp_is_current_on_cached_stats(self, monkeypatch):
+        """The timestamp is taken per call, not frozen with the cached counts."""
+        class FakeDatetime:
+            current = datetime(2026, 1, 1, 0, 0, 0)
+            
+            @classmethod
+            def utcnow(cls):
+                return cls.current
+        
+        monkeypatch.setattr(game_manager_module, "datetime", FakeDatetime)
+        manager = GameManager()
+        assert manager.get_stats()["timestamp"] == "2026-01-01T00:00:00"
+        
+        FakeDatetime.current = datetime(2026, 1, 1, 0, 5, 0)
+        assert manager.get_stats()["timestamp"] == "2026-01-01T00:05:00"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
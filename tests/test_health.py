@@ -0,0 +1,68 @@
+"""
+Test the API health endpoints.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.chipengine import __version__
+from src.chipengine.api import app as app_module
+from src.chipengine.api.database import Base, Bot, Game
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Serve the app against a temporary database, without running the lifespan."""
+    engine = create_engine(f"sqlite:///{tmp_path}/chipengine.db")
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(app_module, "SessionLocal", sessionmaker(bind=engine))
+    monkeypatch.setitem(app_module._health_cache, "bots_count", 0)
+    monkeypatch.setitem(app_module._health_cache, "active_games", 0)
+    
+    app_module.db_ready.clear()
+    yield TestClient(app_module.app)
+    app_module.db_ready.clear()
+    engine.dispose()
+
+
+class TestHealth:
+    """Test the readiness gate and health statistics."""
+    
+    def test_starting_until_ready(self, client):
+        """Both health endpoints answer 503 "starting" until the pool is warm."""
+        for path in ("/", "/health"):
+            response = client.get(path)
+            assert response.status_code == 503
+            assert response.json()["status"] == "starting"
+            assert response.json()["bots_count"] == 0
+    
+    def test_reports_counts_after_refresh(self, client):
+        """Once ready, the body carries the counts from the last refresh."""
+        session = app_module.SessionLocal()
+        session.add(Bot(name="bot", api_key="key", api_key_hash=Bot.hash_api_key("key")))
+        session.flush()
+        bot_id = session.query(Bot.id).scalar()
+        session.add_all([
+            Game(id="active-game", game_type="rps", players=["A", "B"], status="active", bot_id=bot_id),
+            Game(id="done-game", game_type="rps", players=["A", "B"], status="completed", bot_id=bot_id),
+        ])
+        session.commit()
+        session.close()
+        
+        app_module.refresh_health_counts()
+        app_module.db_ready.set()
+        
+        response = client.get("/health")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        data = response.json()
+        assert set(data) == {"status", "version", "timestamp", "bots_count", "active_games"}
+        assert data["status"] == "healthy"
+        assert data["version"] == __version__
+        assert data["bots_count"] == 1
+        assert data["active_games"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,162 @@
+"""
+Test in-memory rate limiting for the bot API.
+"""
+
+import pytest
+from fastapi import HTTPException
+from src.chipengine.api import rate_limiting
+from src.chipengine.api.rate_limiting import (
+    ShardedRateLimiter,
+    SlidingWindowCounterRateLimiter,
+    SlidingWindowRateLimiter
+)
+
+
+class FakeClock:
+    """Controllable replacement for time.time()."""
+    
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freeze the rate limiter clock."""
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiting.time, "time", fake)
+    return fake
+
+
+class TestShardedRateLimiter:
+    """Test the shared limiter base."""
+    
+    def test_missing_hooks_fail_at_construction(self):
+        """A limiter that leaves out a state hook cannot be created."""
+        class IncompleteLimiter(ShardedRateLimiter):
+            def _new_state(self, now):
+                return 0
+        
+        with pytest.raises(TypeError):
+            IncompleteLimiter(max_requests=1, window_seconds=60)
+
+
+class TestSlidingWindowRateLimiter:
+    """Test packed sliding-window rate limiting."""
+    
+    def test_allows_up_to_limit_within_window(self, clock):
+        """No more than max_requests are allowed across the window."""
+        limiter = SlidingWindowRateLimiter(max_requests=3, window_seconds=60)
+        
+        assert limiter.is_allowed("bot_1")
+        clock.now += 20
+        assert limiter.is_allowed("bot_1")
+        assert limiter.is_allowed("bot_1")
+        assert not limiter.is_allowed("bot_1")
+        assert limiter.is_allowed("bot_2")
+    
+    def test_old_slices_expire(self, clock):
+        """Requests stop counting once their slice leaves the window."""
+        limiter = SlidingWindowRateLimiter(max_requests=2, window_seconds=60)
+        
+        assert limiter.is_allowed("bot_1")
+        clock.now += 30
+        assert limiter.is_allowed("bot_1")
+        assert not limiter.is_allowed("bot_1")
+        
+        # The first request has slid out of the window, the second has not
+        clock.now += 31
+        assert limiter.is_allowed("bot_1")
+        assert not limiter.is_allowed("bot_1")
+        
+        # A long idle period clears everything
+        clock.now += 600
+        assert limiter.is_allowed("bot_1")
+        assert limiter.is_allowed("bot_1")
+    
+    def test_evicts_least_recently_seen(self, clock):
+        """A full shard drops its coldest identifier, which starts over."""
+        limiter = SlidingWindowRateLimiter(
+            max_requests=1, window_seconds=60, shards=1, shard_capacity=2
+        )
+        
+        assert limiter.is_allowed("bot_1")
+        assert limiter.is_allowed("bot_2")
+        assert not limiter.is_allowed("bot_1")  # bot_1 is now most recent
+        
+        assert limiter.is_allowed("bot_3")  # evicts bot_2
+        assert not limiter.is_allowed("bot_1")
+        assert limiter.is_allowed("bot_2")
+    
+    def test_check_does_not_count_until_commit(self, clock):
+        """check() only reports; a request counts once committed."""
+        limiter = SlidingWindowRateLimiter(max_requests=1, window_seconds=60)
+        
+        with limiter.lock_for("bot_1"):
+            assert limiter.check("bot_1", clock.now)
+            assert limiter.check("bot_1", clock.now)
+            limiter.commit("bot_1")
+            assert not limiter.check("bot_1", clock.now)
+    
+    def test_rejects_limits_beyond_byte_counters(self):
+        """Slice counts are single bytes, so limits above 255 are refused."""
+        with pytest.raises(ValueError):
+            SlidingWindowRateLimiter(max_requests=256)
+
+
+class TestSlidingWindowCounterRateLimiter:
+    """Test weighted two-window rate limiting."""
+    
+    def test_previous_window_is_weighted_by_overlap(self, clock):
+        """Requests near a window boundary still count against the next one."""
+        clock.now = 1200.0  # start of a window
+        limiter = SlidingWindowCounterRateLimiter(max_requests=4, window_seconds=60)
+        
+        for _ in range(4):
+            assert limiter.is_allowed("bot_1")
+        assert not limiter.is_allowed("bot_1")
+        
+        # Halfway into the next window, half of the previous count remains
+        clock.now += 90
+        assert limiter.is_allowed("bot_1")
+        assert limiter.is_allowed("bot_1")
+        assert not limiter.is_allowed("bot_1")
+        assert limiter.is_allowed("bot_2")
+    
+    def test_idle_windows_reset(self, clock):
+        """Counts older than the previous window are dropped."""
+        limiter = SlidingWindowCounterRateLimiter(max_requests=1, window_seconds=60)
+        
+        assert limiter.is_allowed("bot_1")
+        assert not limiter.is_allowed("bot_1")
+        
+        clock.now += 120
+        assert limiter.is_allowed("bot_1")
+
+
+class TestGameCreationRateLimit:
+    """Test the combined general and game creation check."""
+    
+    def test_rejected_creation_spends_no_general_token(self, clock, monkeypatch):
+        """Hitting the game creation limit leaves the general budget intact."""
+        monkeypatch.setattr(rate_limiting, "bot_rate_limiter", SlidingWindowCounterRateLimiter(max_requests=3))
+        monkeypatch.setattr(rate_limiting, "game_rate_limiter", SlidingWindowRateLimiter(max_requests=1))
+        
+        rate_limiting.check_game_creation_rate_limit(None, 1)
+        for _ in range(3):
+            with pytest.raises(HTTPException) as exc_info:
+                rate_limiting.check_game_creation_rate_limit(None, 1)
+            assert "Game creation" in exc_info.value.detail
+        
+        # The general check draws on the same limiter as game creation
+        rate_limiting.check_bot_rate_limit(None, 1)
+        rate_limiting.check_bot_rate_limit(None, 1)
+        with pytest.raises(HTTPException) as exc_info:
+            rate_limiting.check_bot_rate_limit(None, 1)
+        assert "Maximum 1000 requests" in exc_info.value.detail
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])